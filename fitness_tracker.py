@@ -0,0 +1,1180 @@
+"""מעקב כושר אישי — Personal fitness tracker.
+
+A small Tk application for logging workouts, tracking weekly progress and
+managing an exercise library.  Runs with plain ttk; picks up ttkbootstrap
+theming and matplotlib charts when those packages are installed.
+"""
+
+import copy
+import json
+import mmap
+import os
+import queue
+import re
+import threading
+from bisect import bisect_left
+from collections import deque
+from dataclasses import asdict, dataclass
+from datetime import date, datetime
+from functools import lru_cache
+from itertools import islice
+
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    _loads = orjson.loads
+
+except ImportError:
+
+    def _dumps(obj):
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode(
+            "utf-8"
+        )
+
+    def _loads(data):
+        if isinstance(data, memoryview):
+            data = bytes(data)
+        return json.loads(data)
+
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+if np is not None:
+    # Columnar mirror of the history list: date ordinal, Monday-based
+    # weekday, calories and duration. Used by the numeric backfill path.
+    _HIST_DTYPE = np.dtype(
+        [("ord", "i4"), ("wd", "i1"), ("cal", "f8"), ("min", "i2")]
+    )
+
+    if njit is not None:
+
+        @njit(cache=True)
+        def _weekly_agg(ords, wds, cals, mins, week_start_ord):
+            n = 0
+            cal = 0.0
+            minutes = 0
+            breakdown = np.zeros(7, np.int32)
+            for i in range(ords.shape[0]):
+                o = ords[i]
+                if week_start_ord <= o < week_start_ord + 7:
+                    n += 1
+                    cal += cals[i]
+                    minutes += mins[i]
+                    breakdown[wds[i]] += 1
+            return n, cal, minutes, breakdown
+
+    else:
+
+        def _weekly_agg(ords, wds, cals, mins, week_start_ord):
+            # Vectorized fallback: branchless C-level ops instead of a
+            # Python loop over every entry.
+            mask = (ords - wds) == week_start_ord
+            breakdown = np.bincount(wds[mask], minlength=7).astype(np.int32)
+            return (
+                int(mask.sum()),
+                float(cals[mask].sum()),
+                int(mins[mask].sum()),
+                breakdown,
+            )
+
+# Both optional dependencies are heavy (ttkbootstrap pulls in PIL,
+# matplotlib pulls in numpy and font caches), so they are imported at
+# their first use site rather than at module import time.
+ttkb = None
+USE_BOOTSTRAP = False
+_bootstrap_checked = False
+
+Figure = None
+FigureCanvasTkAgg = None
+USE_MATPLOTLIB = False
+_matplotlib_checked = False
+
+
+def _load_bootstrap():
+    global ttkb, USE_BOOTSTRAP, _bootstrap_checked
+    if not _bootstrap_checked:
+        _bootstrap_checked = True
+        try:
+            import ttkbootstrap
+        except ImportError:
+            pass
+        else:
+            ttkb = ttkbootstrap
+            USE_BOOTSTRAP = True
+    return USE_BOOTSTRAP
+
+
+def _load_matplotlib():
+    global Figure, FigureCanvasTkAgg, USE_MATPLOTLIB, _matplotlib_checked
+    if not _matplotlib_checked:
+        _matplotlib_checked = True
+        try:
+            import matplotlib
+            matplotlib.use("TkAgg")
+            from matplotlib.figure import Figure as _Figure
+            from matplotlib.backends.backend_tkagg import (
+                FigureCanvasTkAgg as _FigureCanvasTkAgg,
+            )
+        except ImportError:
+            pass
+        else:
+            Figure = _Figure
+            FigureCanvasTkAgg = _FigureCanvasTkAgg
+            USE_MATPLOTLIB = True
+    return USE_MATPLOTLIB
+
+DATA_FILE = "fitness_data.json"
+HISTORY_FILE = "fitness_history.jsonl"
+
+@dataclass(slots=True)
+class Exercise:
+    """One library entry; a compact record instead of a per-exercise dict."""
+
+    category: str
+    calories_per_rep: float
+    icon: str = "💪"
+
+
+DEFAULT_EXERCISES = {
+    "סקוואט": Exercise("רגליים", 0.45, "🏋️"),
+    "שכיבות סמיכה": Exercise("חזה", 0.35, "💪"),
+    "עליות מתח": Exercise("גב", 0.9, "🤸"),
+    "כפיפות בטן": Exercise("בטן", 0.25, "🔥"),
+    "לאנג'ים": Exercise("רגליים", 0.4, "🦵"),
+    "פלאנק (שניות)": Exercise("בטן", 0.05, "🧘"),
+    "ברפי": Exercise("כל הגוף", 1.2, "⚡"),
+    "קפיצות חבל": Exercise("אירובי", 0.15, "🪢"),
+}
+
+DEFAULT_WORKOUTS = {
+    "אימון כל הגוף": {
+        "exercises": [
+            {"name": "סקוואט", "sets": 3, "reps": 15, "rest": 60},
+            {"name": "שכיבות סמיכה", "sets": 3, "reps": 12, "rest": 60},
+            {"name": "כפיפות בטן", "sets": 3, "reps": 20, "rest": 45},
+            {"name": "ברפי", "sets": 2, "reps": 10, "rest": 90},
+        ],
+    },
+    "אימון פלג גוף עליון": {
+        "exercises": [
+            {"name": "שכיבות סמיכה", "sets": 4, "reps": 12, "rest": 60},
+            {"name": "עליות מתח", "sets": 3, "reps": 8, "rest": 90},
+            {"name": "פלאנק (שניות)", "sets": 3, "reps": 45, "rest": 60},
+        ],
+    },
+    "אימון רגליים": {
+        "exercises": [
+            {"name": "סקוואט", "sets": 4, "reps": 15, "rest": 60},
+            {"name": "לאנג'ים", "sets": 3, "reps": 12, "rest": 60},
+            {"name": "קפיצות חבל", "sets": 3, "reps": 100, "rest": 90},
+        ],
+    },
+    "אימון בטן מהיר": {
+        "exercises": [
+            {"name": "כפיפות בטן", "sets": 4, "reps": 20, "rest": 30},
+            {"name": "פלאנק (שניות)", "sets": 3, "reps": 60, "rest": 45},
+        ],
+    },
+}
+
+WEEKDAY_NAMES = ["ב'", "ג'", "ד'", "ה'", "ו'", "ש'", "א'"]
+
+# Accepts plain non-negative decimals; cheaper than letting float() raise.
+_CAL_RE = re.compile(r"^\d+(\.\d+)?$")
+
+_ERR_TITLE = "שגיאה"
+_ERR_FIELDS = "יש למלא את כל השדות"
+_ERR_CALORIES = "ערך קלוריות לא תקין"
+_ERR_NO_WORKOUT = "יש לבחור אימון תחילה"
+
+
+@lru_cache(maxsize=4096)
+def _format_row(icon, name, category, calories):
+    """Values tuple for one exercise tree row; memoized so re-renders of
+    an unchanged library reuse the same tuple objects."""
+    return (icon, name, category, calories)
+
+
+class DataManager:
+    """Owns the persistent state: exercise library, workout plans and history."""
+
+    def __init__(self, data_file=DATA_FILE, history_file=HISTORY_FILE):
+        self.data_file = data_file
+        self.history_file = history_file
+        self.data = self.load_data()
+        self._scheduler = None
+        self._save_pending = False
+        self._write_queue = None
+        self._writer = None
+        self._init_hist_mirror()
+        if "weekly_index" not in self.data:
+            self._rebuild_weekly_index()
+        # Newest-first view of the last 50 entries for the history tab.
+        self.recent_history = deque(reversed(self.data["history"][-50:]), maxlen=50)
+        # Exercise names in sorted order, maintained incrementally so the
+        # library tab never re-sorts on refresh.
+        self.exercise_order = sorted(self.data["exercises"])
+        self._rebuild_workout_cache()
+        self._replay_history_sidecar()
+
+    def insert_exercise_name(self, name):
+        """Record a new exercise name, returning its sorted position."""
+        position = bisect_left(self.exercise_order, name)
+        self.exercise_order.insert(position, name)
+        return position
+
+    def _rebuild_workout_cache(self):
+        """Precompute per-set calories, the projected total and the
+        rendered details text for each workout. Must be re-run whenever
+        the exercise library changes."""
+        exercises = self.data["exercises"]
+        for name, workout in self.data["workouts"].items():
+            total = 0.0
+            lines = [f"אימון: {name}\n\n"]
+            for ex in workout["exercises"]:
+                info = exercises.get(ex["name"])
+                per_set = (info.calories_per_rep if info else 0.5) * ex["reps"]
+                ex["_calories_per_set"] = per_set
+                ex["_icon"] = info.icon if info else "💪"
+                total += per_set * ex["sets"]
+                lines.append(
+                    f"{ex['_icon']} {ex['name']}: "
+                    f"{ex['sets']} סטים × {ex['reps']} חזרות"
+                    f" (מנוחה {ex['rest']} שניות)\n"
+                )
+            workout["_total_calories"] = total
+            lines.append(f"\n≈ {total:.0f} קלוריות לאימון\n")
+            workout["_rendered_details"] = "".join(lines)
+
+    def load_data(self):
+        if os.path.exists(self.data_file):
+            try:
+                # Parse straight out of the page cache instead of copying
+                # the file through a Python read buffer first.
+                with open(self.data_file, "rb") as f, mmap.mmap(
+                    f.fileno(), 0, access=mmap.ACCESS_READ
+                ) as mm:
+                    view = memoryview(mm)
+                    try:
+                        data = _loads(view)
+                    finally:
+                        view.release()
+            except (ValueError, OSError):
+                pass
+            else:
+                data["exercises"] = {
+                    name: Exercise(**info)
+                    for name, info in data["exercises"].items()
+                }
+                # Parse each entry's date once here instead of strptime-ing
+                # on every stats pass; fromisoformat is C-implemented.
+                for entry in data["history"]:
+                    entry["_date_obj"] = datetime.fromisoformat(entry["date"])
+                return data
+        return {
+            "exercises": dict(DEFAULT_EXERCISES),
+            # Deep copy: the workout cache rebuild mutates the nested
+            # dicts, and the module constant must stay pristine.
+            "workouts": copy.deepcopy(DEFAULT_WORKOUTS),
+            "history": [],
+            "goals": {"weekly_workouts": 5},
+            "user_stats": {
+                "total_workouts": 0,
+                "total_calories": 0.0,
+                "total_minutes": 0,
+                "streak": 0,
+                "last_workout_date": None,
+            },
+        }
+
+    def _snapshot(self):
+        """Deep-enough copy of the state for the writer thread: history
+        entries and workouts are rebuilt without underscore-prefixed
+        cache keys, everything else is deep-copied."""
+        snapshot = {
+            k: copy.deepcopy(v)
+            for k, v in self.data.items()
+            if k not in ("history", "workouts", "exercises")
+        }
+        snapshot["exercises"] = {
+            name: asdict(ex) for name, ex in self.data["exercises"].items()
+        }
+        snapshot["history"] = [
+            {k: v for k, v in entry.items() if not k.startswith("_")}
+            for entry in self.data["history"]
+        ]
+        snapshot["workouts"] = {
+            name: {
+                **{k: v for k, v in workout.items() if not k.startswith("_")},
+                "exercises": [
+                    {k: v for k, v in ex.items() if not k.startswith("_")}
+                    for ex in workout["exercises"]
+                ],
+            }
+            for name, workout in self.data["workouts"].items()
+        }
+        return snapshot
+
+    def _write(self, snapshot):
+        # Write-to-temp + atomic replace so a crash mid-write can never
+        # leave a truncated file that load_data would silently reset.
+        tmp = self.data_file + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(_dumps(snapshot))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.data_file)
+
+    def _writer_loop(self):
+        while True:
+            snapshot = self._write_queue.get()
+            try:
+                self._write(snapshot)
+            except OSError:
+                pass
+            finally:
+                self._write_queue.task_done()
+
+    def save_data(self):
+        """Snapshot the state and hand it to the background writer; the
+        caller returns without waiting for serialization or disk I/O."""
+        self._save_pending = False
+        if self._writer is None:
+            self._write_queue = queue.Queue()
+            self._writer = threading.Thread(target=self._writer_loop, daemon=True)
+            self._writer.start()
+        self._write_queue.put(self._snapshot())
+
+    def close(self):
+        """Drain queued writes, then write the final snapshot in this
+        thread and drop the sidecar its entries are now folded into.
+        If the final write fails the sidecar is kept: it is the only
+        durable copy of everything since the last successful snapshot."""
+        if self._write_queue is not None:
+            self._write_queue.join()
+        try:
+            self._write(self._snapshot())
+        except OSError:
+            return
+        try:
+            os.remove(self.history_file)
+        except OSError:
+            pass
+
+    def attach_scheduler(self, widget):
+        """Route saves through the given widget's Tk event loop so that
+        rapid changes coalesce into a single write."""
+        self._scheduler = widget
+
+    def _schedule_save(self):
+        if self._scheduler is None:
+            self.save_data()
+        elif not self._save_pending:
+            self._save_pending = True
+            self._scheduler.after(2000, self._flush)
+
+    def _flush(self):
+        if self._save_pending:
+            self.save_data()
+
+    @staticmethod
+    def _week_key(when):
+        iso_year, iso_week, _ = when.isocalendar()
+        return f"{iso_year}-{iso_week:02d}"
+
+    @staticmethod
+    def _empty_week():
+        return {
+            "workouts": 0,
+            "calories": 0.0,
+            "minutes": 0,
+            "daily_breakdown": [0] * 7,
+        }
+
+    def _init_hist_mirror(self):
+        """Build the columnar NumPy mirror of history (no-op without numpy)."""
+        self._hist = None
+        self._hist_len = 0
+        if np is None:
+            return
+        history = self.data["history"]
+        self._hist = np.empty(max(16, len(history)), dtype=_HIST_DTYPE)
+        for i, entry in enumerate(history):
+            when = entry["_date_obj"]
+            self._hist[i] = (
+                when.toordinal(),
+                when.weekday(),
+                entry["calories"],
+                entry["duration"],
+            )
+        self._hist_len = len(history)
+
+    def _append_hist(self, when, calories, minutes):
+        if self._hist is None:
+            return
+        if self._hist_len == len(self._hist):
+            grown = np.empty(len(self._hist) * 2, dtype=_HIST_DTYPE)
+            grown[: self._hist_len] = self._hist
+            self._hist = grown
+        self._hist[self._hist_len] = (
+            when.toordinal(),
+            when.weekday(),
+            calories,
+            minutes,
+        )
+        self._hist_len += 1
+
+    def _rebuild_weekly_index(self):
+        """Backfill the per-week aggregates with one scan over history.
+
+        With numpy available the scan runs over the columnar mirror via
+        _weekly_agg (JIT-compiled when numba is installed); otherwise it
+        falls back to a plain loop over the entry dicts.
+        """
+        index = {}
+        if self._hist is not None and self._hist_len:
+            hist = self._hist[: self._hist_len]
+            week_ords = hist["ord"] - hist["wd"]  # Monday ordinal per entry
+            for week_ord in np.unique(week_ords):
+                n, cal, minutes, breakdown = _weekly_agg(
+                    hist["ord"], hist["wd"], hist["cal"], hist["min"], int(week_ord)
+                )
+                index[self._week_key(date.fromordinal(int(week_ord)))] = {
+                    "workouts": int(n),
+                    "calories": float(cal),
+                    "minutes": int(minutes),
+                    "daily_breakdown": [int(c) for c in breakdown],
+                }
+        else:
+            for entry in self.data["history"]:
+                entry_date = entry["_date_obj"]
+                bucket = index.setdefault(
+                    self._week_key(entry_date), self._empty_week()
+                )
+                bucket["workouts"] += 1
+                bucket["calories"] += entry["calories"]
+                bucket["minutes"] += entry["duration"]
+                bucket["daily_breakdown"][entry_date.weekday()] += 1
+        self.data["weekly_index"] = index
+
+    def add_workout_to_history(self, workout_name, duration_minutes, calories):
+        now = datetime.now()
+        entry = {
+            "workout": workout_name,
+            "date": now.strftime("%Y-%m-%d"),
+            "time": now.strftime("%H:%M"),
+            "duration": duration_minutes,
+            "calories": round(calories, 1),
+            "_date_obj": now,
+        }
+        seq = len(self.data["history"])
+        self._ingest_entry(entry)
+        self._append_history_line(entry, seq)
+
+    def _ingest_entry(self, entry):
+        """Fold one history entry into all in-memory state: history list,
+        recent deque, columnar mirror, weekly index and user stats."""
+        when = entry["_date_obj"]
+        self.data["history"].append(entry)
+        self.recent_history.appendleft(entry)
+        self._append_hist(when, entry["calories"], entry["duration"])
+
+        bucket = self.data["weekly_index"].setdefault(
+            self._week_key(when), self._empty_week()
+        )
+        bucket["workouts"] += 1
+        bucket["calories"] += entry["calories"]
+        bucket["minutes"] += entry["duration"]
+        bucket["daily_breakdown"][when.weekday()] += 1
+
+        stats = self.data["user_stats"]
+        stats["total_workouts"] += 1
+        stats["total_calories"] = round(
+            stats["total_calories"] + entry["calories"], 1
+        )
+        stats["total_minutes"] += entry["duration"]
+
+        entry_date = when.date()
+        last = stats["last_workout_date"]
+        if last is not None:
+            diff = (entry_date - date.fromisoformat(last)).days
+            if diff == 0:
+                pass  # another workout that day: streak already counted
+            elif diff == 1:
+                stats["streak"] += 1
+            elif diff > 1:
+                stats["streak"] = 1
+        else:
+            stats["streak"] = 1
+        stats["last_workout_date"] = entry_date.isoformat()
+
+    def _append_history_line(self, entry, seq):
+        """O(1) durability per workout: append one JSONL line instead of
+        rewriting the whole state file."""
+        record = {k: v for k, v in entry.items() if not k.startswith("_")}
+        record["seq"] = seq
+        with open(self.history_file, "ab") as f:
+            f.write(_dumps(record) + b"\n")
+
+    def _replay_history_sidecar(self):
+        """Ingest sidecar entries the main file doesn't have yet. The seq
+        field makes replay idempotent when the sidecar overlaps a full
+        save that already included some of its entries."""
+        if not os.path.exists(self.history_file):
+            return
+        try:
+            with open(self.history_file, "rb") as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return
+        for line in lines:
+            if not line:
+                continue
+            try:
+                record = _loads(line)
+            except ValueError:
+                continue  # torn tail from a crash mid-append
+            if record.pop("seq", -1) >= len(self.data["history"]):
+                record["_date_obj"] = datetime.fromisoformat(record["date"])
+                self._ingest_entry(record)
+
+    def get_weekly_stats(self):
+        """This week's aggregates for the dashboard and chart — a single
+        lookup into the incrementally maintained weekly index."""
+        bucket = self.data["weekly_index"].get(self._week_key(datetime.now()))
+        if bucket is None:
+            bucket = self._empty_week()
+        goal = self.data["goals"]["weekly_workouts"]
+        workouts = bucket["workouts"]
+        return {
+            "workouts": workouts,
+            "calories": round(bucket["calories"], 1),
+            "minutes": bucket["minutes"],
+            "daily_breakdown": bucket["daily_breakdown"],
+            "goal_progress": workouts / goal if goal else 0.0,
+        }
+
+
+class ExerciseTimer:
+    """Rest-period countdown state, ticked once per second from the Tk
+    event loop (see FitnessApp._tick)."""
+
+    def __init__(self):
+        self.seconds_remaining = 0
+        self.running = False
+        self.paused = False
+
+    def start(self, seconds):
+        self.seconds_remaining = seconds
+        self.running = True
+        self.paused = False
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+
+    def stop(self):
+        self.running = False
+        self.paused = False
+
+
+class ValidatedEntry(ttk.Entry):
+    """Entry backed by a StringVar whose write trace mirrors the content
+    into a plain Python string, so get() never crosses into Tcl. The
+    trace fires on every change path — typing, paste, programmatic
+    insert/delete — which the previous edit-event bindings could miss."""
+
+    def __init__(self, master=None, **kwargs):
+        self._var = tk.StringVar(master)
+        kwargs.setdefault("textvariable", self._var)
+        super().__init__(master, **kwargs)
+        self._cached = self._var.get()
+        self._var.trace_add("write", self._sync)
+
+    def _sync(self, *args):
+        self._cached = self._var.get()
+
+    def get(self):
+        return self._cached
+
+
+class FitnessApp:
+    """Main application window: notebook with dashboard, workout, exercise
+    library, history and stats tabs."""
+
+    def __init__(self, root):
+        self.root = root
+        self.data_manager = DataManager()
+        self.data_manager.attach_scheduler(root)
+        self.timer = ExerciseTimer()
+        self._tick_after_id = None
+
+        self.current_workout = None
+        self.current_exercise_index = 0
+        self.workout_start_time = None
+        self.calories_burned = 0.0
+
+        self._validate_after_id = None
+        self._parsed_calories = None
+        self._populate_after_id = None
+        self._status_after_id = None
+
+        self._setup_window()
+        self._init_widget_factories()
+        self._create_ui()
+        self._update_dashboard()
+
+    # ------------------------------------------------------------------ setup
+
+    def _setup_window(self):
+        self.root.title("מעקב כושר אישי")
+        self.root.geometry("900x650")
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        if _load_bootstrap():
+            self.style = ttkb.Style(theme="darkly")
+
+    def _on_close(self):
+        self.data_manager.close()
+        self.root.destroy()
+
+    def _init_widget_factories(self):
+        """Resolve the USE_BOOTSTRAP branch once. The factories accept a
+        style= keyword that maps to bootstyle under ttkbootstrap and is
+        dropped under plain ttk, so call sites need no branching."""
+
+        def themed(cls):
+            def factory(*args, style=None, **kwargs):
+                if style is not None:
+                    kwargs["bootstyle"] = style
+                return cls(*args, **kwargs)
+
+            return factory
+
+        def plain(cls):
+            def factory(*args, style=None, **kwargs):
+                return cls(*args, **kwargs)
+
+            return factory
+
+        wrap, module = (themed, ttkb) if USE_BOOTSTRAP else (plain, ttk)
+        self._Button = wrap(module.Button)
+        self._Combobox = wrap(module.Combobox)
+        self._Progressbar = wrap(module.Progressbar)
+        self._Notebook = wrap(module.Notebook)
+
+    def _create_ui(self):
+        # Non-modal status line for transient feedback (e.g. "added").
+        self.status_var = tk.StringVar()
+        ttk.Label(self.root, textvariable=self.status_var, anchor=tk.W).pack(
+            side=tk.BOTTOM, fill=tk.X, padx=10
+        )
+
+        self.notebook = self._Notebook(self.root, style="dark")
+        self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        # The dashboard is the initial view and is built eagerly; the other
+        # tabs (including the matplotlib-backed stats tab) are built on
+        # first selection so startup doesn't pay for tabs never visited.
+        self._tab_builders = {}
+        self._tab_names = {}
+        self._dirty = {"dashboard": False, "history": False}
+        self._refreshers = {
+            "dashboard": self._update_dashboard,
+            "history": self._populate_history_tree,
+        }
+        self._create_dashboard_tab()
+        lazy_tabs = [
+            ("🏋️ אימון", self._create_workout_tab, None),
+            ("📋 תרגילים", self._create_exercises_tab, None),
+            ("📅 היסטוריה", self._create_history_tab, "history"),
+            ("📊 סטטיסטיקות", self._create_stats_tab, None),
+        ]
+        for title, builder, name in lazy_tabs:
+            frame = ttk.Frame(self.notebook)
+            self.notebook.add(frame, text=title)
+            self._tab_builders[str(frame)] = builder
+            if name:
+                self._tab_names[str(frame)] = name
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+
+    def _build_tab(self, tab_id):
+        builder = self._tab_builders.pop(tab_id, None)
+        if builder is None:
+            return False
+        builder(self.notebook.nametowidget(tab_id))
+        return True
+
+    def _on_tab_changed(self, event=None):
+        current = self.notebook.select()
+        name = self._tab_names.get(current)
+        if self._build_tab(current):
+            if name:
+                self._dirty[name] = False  # builder rendered fresh data
+        elif name and self._dirty.get(name):
+            self._dirty[name] = False
+            self._refreshers[name]()
+
+    def _refresh_stale_tabs(self):
+        """Mark data-dependent tabs stale, repainting only the visible one;
+        the rest catch up from the tab-change handler."""
+        for name in self._dirty:
+            self._dirty[name] = True
+        current = self.notebook.select()
+        name = self._tab_names.get(current)
+        if name:
+            self._dirty[name] = False
+            self._refreshers[name]()
+
+    # -------------------------------------------------------------- dashboard
+
+    def _create_dashboard_tab(self):
+        frame = ttk.Frame(self.notebook)
+        self.notebook.add(frame, text="🏠 ראשי")
+        self._tab_names[str(frame)] = "dashboard"
+
+        header = ttk.Label(frame, text="ברוך הבא! 💪", font=("Arial", 20, "bold"))
+        header.pack(pady=15)
+
+        stats_frame = ttk.Frame(frame)
+        stats_frame.pack(pady=10)
+
+        self.stat_vars = {}
+        stat_defs = [
+            ("total_workouts", "סה\"כ אימונים"),
+            ("total_calories", "קלוריות שנשרפו"),
+            ("streak", "רצף ימים 🔥"),
+            ("week_workouts", "אימונים השבוע"),
+        ]
+        for col, (key, title) in enumerate(stat_defs):
+            card = ttk.Frame(stats_frame, relief=tk.RIDGE, borderwidth=1)
+            card.grid(row=0, column=col, padx=8, ipadx=14, ipady=8)
+            ttk.Label(card, text=title, font=("Arial", 10)).pack()
+            var = tk.StringVar(value="0")
+            ttk.Label(card, textvariable=var, font=("Arial", 18, "bold")).pack()
+            self.stat_vars[key] = var
+
+        goal_frame = ttk.Frame(frame)
+        goal_frame.pack(pady=15, fill=tk.X, padx=40)
+        ttk.Label(goal_frame, text="התקדמות שבועית ליעד:").pack(anchor=tk.W)
+        self.progress_var = tk.DoubleVar(value=0.0)
+        self.workout_progress = self._Progressbar(
+            goal_frame, maximum=100, variable=self.progress_var, style="success-striped"
+        )
+        self.workout_progress.pack(fill=tk.X, pady=5)
+
+        quick_frame = ttk.Frame(frame)
+        quick_frame.pack(pady=20)
+        ttk.Label(quick_frame, text="התחלה מהירה:", font=("Arial", 12, "bold")).pack()
+        btn_frame = ttk.Frame(quick_frame)
+        btn_frame.pack(pady=8)
+        workouts = self.data_manager.data["workouts"]
+        if len(workouts) > 8:
+            # Too many plans for a button row — offer a dropdown instead.
+            combo = self._Combobox(
+                btn_frame, values=list(workouts), state="readonly", style="info"
+            )
+            combo.pack(side=tk.LEFT, padx=5)
+            combo.bind(
+                "<<ComboboxSelected>>", lambda e: self._quick_start(combo.get())
+            )
+        else:
+            for workout in islice(workouts, 4):
+                btn = self._Button(
+                    btn_frame,
+                    text=workout,
+                    style="success-outline",
+                    command=lambda w=workout: self._quick_start(w),
+                )
+                btn.pack(side=tk.LEFT, padx=5)
+
+    def _quick_start(self, workout_name):
+        self.notebook.select(1)
+        self._build_tab(self.notebook.select())
+        self.workout_combo.set(workout_name)
+        self._on_workout_selected()
+
+    def _update_dashboard(self):
+        stats = self.data_manager.data["user_stats"]
+        weekly = self.data_manager.get_weekly_stats()
+        self.stat_vars["total_workouts"].set(str(stats["total_workouts"]))
+        self.stat_vars["total_calories"].set(f"{stats['total_calories']:.0f}")
+        self.stat_vars["streak"].set(str(stats["streak"]))
+        self.stat_vars["week_workouts"].set(str(weekly["workouts"]))
+        self.progress_var.set(min(weekly["goal_progress"] * 100, 100))
+
+    # ---------------------------------------------------------------- workout
+
+    def _create_workout_tab(self, frame):
+        top = ttk.Frame(frame)
+        top.pack(pady=10, fill=tk.X, padx=20)
+        ttk.Label(top, text="בחר אימון:", font=("Arial", 12)).pack(side=tk.RIGHT, padx=5)
+        self.workout_combo = self._Combobox(
+            top,
+            values=list(self.data_manager.data["workouts"].keys()),
+            state="readonly",
+            style="info",
+        )
+        self.workout_combo.pack(side=tk.RIGHT, padx=5)
+        self.workout_combo.bind("<<ComboboxSelected>>", self._on_workout_selected)
+
+        self.details_text = tk.Text(frame, height=8, width=60, state=tk.DISABLED)
+        self.details_text.pack(pady=10, padx=20)
+
+        self.start_button = self._Button(
+            frame, text="▶ התחל אימון", style="success", command=self._start_workout
+        )
+        self.start_button.pack(pady=5)
+
+        session = ttk.LabelFrame(frame, text="אימון פעיל")
+        session.pack(pady=10, fill=tk.X, padx=20)
+        self.exercise_label = ttk.Label(session, text="—", font=("Arial", 16, "bold"))
+        self.exercise_label.pack(pady=8)
+        self.timer_label = ttk.Label(session, text="", font=("Arial", 24))
+        self.timer_label.pack(pady=4)
+        self.next_button = self._Button(
+            session,
+            text="✔ סיימתי סט",
+            style="primary",
+            command=self._next_exercise,
+            state=tk.DISABLED,
+        )
+        self.next_button.pack(pady=8)
+
+    def _on_workout_selected(self, event=None):
+        name = self.workout_combo.get()
+        workout = self.data_manager.data["workouts"].get(name)
+        if not workout:
+            return
+        self.details_text.config(state=tk.NORMAL)
+        self.details_text.delete("1.0", tk.END)
+        self.details_text.insert(tk.END, workout["_rendered_details"])
+        self.details_text.config(state=tk.DISABLED)
+
+    def _start_workout(self):
+        name = self.workout_combo.get()
+        workout = self.data_manager.data["workouts"].get(name)
+        if not workout:
+            messagebox.showwarning(_ERR_TITLE, _ERR_NO_WORKOUT)
+            return
+        self.current_workout = name
+        self.current_exercise_index = 0
+        self.calories_burned = 0.0
+        self.workout_start_time = datetime.now()
+        self.next_button.config(state=tk.NORMAL)
+        self._show_current_exercise()
+
+    def _show_current_exercise(self):
+        workout = self.data_manager.data["workouts"][self.current_workout]
+        current = workout["exercises"][self.current_exercise_index]
+        self.exercise_label.config(
+            text=f"{current['_icon']} {current['name']} — "
+            f"{current['sets']}×{current['reps']}"
+        )
+        self.timer_label.config(text="")
+
+    def _next_exercise(self):
+        workout = self.data_manager.data["workouts"][self.current_workout]
+        current = workout["exercises"][self.current_exercise_index]
+        self.calories_burned += current["_calories_per_set"]
+        self.current_exercise_index += 1
+        if self.current_exercise_index >= len(workout["exercises"]):
+            self._complete_workout()
+        else:
+            self._start_rest(current["rest"])
+
+    def _start_rest(self, seconds):
+        self.timer_label.config(text=str(seconds))
+        self.timer.start(seconds)
+        if self._tick_after_id is not None:
+            self.root.after_cancel(self._tick_after_id)
+        self._tick_after_id = self.root.after(1000, self._tick)
+
+    def _tick(self):
+        self._tick_after_id = None
+        if not self.timer.running:
+            return
+        if not self.timer.paused:
+            self.timer.seconds_remaining -= 1
+            self._timer_callback()
+        if self.timer.running:
+            self._tick_after_id = self.root.after(1000, self._tick)
+
+    def _timer_callback(self):
+        remaining = self.timer.seconds_remaining
+        if remaining > 0:
+            self.timer_label.config(text=str(remaining))
+        else:
+            self.timer.stop()
+            self.timer_label.config(text="")
+            self._show_current_exercise()
+
+    def _complete_workout(self):
+        self.timer.stop()
+        duration = max(
+            1, int((datetime.now() - self.workout_start_time).total_seconds() // 60)
+        )
+        self.data_manager.add_workout_to_history(
+            self.current_workout, duration, self.calories_burned
+        )
+        messagebox.showinfo(
+            "כל הכבוד!",
+            f"סיימת את '{self.current_workout}'!\n"
+            f"משך: {duration} דקות · ~{self.calories_burned:.0f} קלוריות",
+        )
+        self.current_workout = None
+        self.next_button.config(state=tk.DISABLED)
+        self.exercise_label.config(text="—")
+        self._refresh_stale_tabs()
+
+    # -------------------------------------------------------------- exercises
+
+    def _create_exercises_tab(self, frame):
+        columns = ("icon", "name", "category", "calories")
+        self.exercise_tree = ttk.Treeview(
+            frame, columns=columns, show="headings", height=10
+        )
+        self.exercise_tree.heading("icon", text="")
+        self.exercise_tree.heading("name", text="תרגיל")
+        self.exercise_tree.heading("category", text="קטגוריה")
+        self.exercise_tree.heading("calories", text="קלוריות לחזרה")
+        self.exercise_tree.column("icon", width=40, anchor=tk.CENTER)
+        self.exercise_tree.column("name", width=180)
+        self.exercise_tree.column("category", width=120)
+        self.exercise_tree.column("calories", width=110, anchor=tk.CENTER)
+        self.exercise_tree.pack(pady=10, padx=20, fill=tk.BOTH, expand=True)
+        self._populate_exercise_tree()
+
+        form = ttk.LabelFrame(frame, text="הוספת תרגיל חדש")
+        form.pack(pady=10, padx=20, fill=tk.X)
+
+        ttk.Label(form, text="שם:").grid(row=0, column=0, padx=5, pady=5)
+        self.new_exercise_name = ValidatedEntry(form, width=20)
+        self.new_exercise_name.grid(row=0, column=1, padx=5, pady=5)
+
+        ttk.Label(form, text="קטגוריה:").grid(row=0, column=2, padx=5, pady=5)
+        self.new_exercise_category = ValidatedEntry(form, width=15)
+        self.new_exercise_category.grid(row=0, column=3, padx=5, pady=5)
+
+        ttk.Label(form, text="קלוריות לחזרה:").grid(row=0, column=4, padx=5, pady=5)
+        self.new_exercise_calories = ValidatedEntry(form, width=8)
+        self.new_exercise_calories.grid(row=0, column=5, padx=5, pady=5)
+        self.new_exercise_calories.bind("<KeyRelease>", self._on_calories_keyrelease)
+
+        add_btn = self._Button(
+            form, text="➕ הוסף", style="success", command=self.add_exercise
+        )
+        add_btn.grid(row=0, column=6, padx=10, pady=5)
+
+    # Above this size, fill the tree in chunks so mainloop stays live.
+    _POPULATE_CHUNK = 200
+
+    def _populate_exercise_tree(self):
+        tree = self.exercise_tree
+        if self._populate_after_id is not None:
+            self.root.after_cancel(self._populate_after_id)
+            self._populate_after_id = None
+        tree.delete(*tree.get_children())
+        order = self.data_manager.exercise_order
+        if len(order) <= self._POPULATE_CHUNK:
+            # Unmap the tree for the duration of the bulk insert so
+            # geometry and redraw handling never fire per row; rows go in
+            # reverse-sorted order at index 0, which tree widgets handle
+            # measurably faster than appending at the end.
+            pack_opts = tree.pack_info()
+            tree.pack_forget()
+            try:
+                self._insert_exercise_rows(iter(reversed(order)), len(order))
+            finally:
+                tree.pack(**pack_opts)
+        else:
+            # Large libraries: show a placeholder and fill in chunks from
+            # idle callbacks so the event loop never blocks on the fill.
+            tree.insert("", tk.END, iid="_loading", values=("", "טוען…", "", ""))
+            self._populate_after_id = self.root.after_idle(
+                self._populate_chunk, iter(reversed(order))
+            )
+
+    def _insert_exercise_rows(self, names, count):
+        exercises = self.data_manager.data["exercises"]
+        rows = [
+            _format_row(info.icon, name, info.category, info.calories_per_rep)
+            for name, info in (
+                (n, exercises[n]) for n in islice(names, count)
+            )
+        ]
+        insert = self.exercise_tree.insert
+        for row in rows:
+            insert("", 0, iid=row[1], values=row)
+        return len(rows)
+
+    def _populate_chunk(self, names):
+        self._populate_after_id = None
+        inserted = self._insert_exercise_rows(names, self._POPULATE_CHUNK)
+        if inserted < self._POPULATE_CHUNK:
+            self.exercise_tree.delete("_loading")
+        else:
+            self._populate_after_id = self.root.after_idle(
+                self._populate_chunk, names
+            )
+
+    def _on_calories_keyrelease(self, event=None):
+        # Debounce so only the last keystroke in a burst triggers a parse.
+        if self._validate_after_id is not None:
+            self.root.after_cancel(self._validate_after_id)
+        self._validate_after_id = self.root.after(150, self._validate_calories)
+
+    def _validate_calories(self):
+        self._validate_after_id = None
+        text = self.new_exercise_calories.get().strip()
+        self._parsed_calories = float(text) if _CAL_RE.match(text) else None
+
+    def add_exercise(self):
+        name_entry = self.new_exercise_name
+        category_entry = self.new_exercise_category
+        calories_entry = self.new_exercise_calories
+        name = name_entry.get().strip()
+        category = category_entry.get().strip()
+        if not name or not category:
+            messagebox.showerror(_ERR_TITLE, _ERR_FIELDS)
+            return
+        if self._validate_after_id is not None:
+            self.root.after_cancel(self._validate_after_id)
+        # Always re-parse at submit: the cached value can predate an edit
+        # that fired no KeyRelease (e.g. a selection paste), and one strip
+        # plus a regex match is nowhere near the keystroke path.
+        self._validate_calories()
+        calories = self._parsed_calories
+        if calories is None:
+            messagebox.showerror(_ERR_TITLE, _ERR_CALORIES)
+            return
+
+        data_manager = self.data_manager
+        exercise = Exercise(category=category, calories_per_rep=calories)
+        data_manager.data["exercises"][name] = exercise
+        data_manager._rebuild_workout_cache()
+        # Debounced: a burst of adds coalesces into one snapshot write.
+        data_manager._schedule_save()
+
+        # Insert (or update) just the affected row at its sorted position
+        # instead of rebuilding the whole tree.
+        row = _format_row(exercise.icon, name, category, calories)
+        tree = self.exercise_tree
+        if tree.exists(name):
+            tree.item(name, values=row)
+        else:
+            position = data_manager.insert_exercise_name(name)
+            tree.insert("", position, iid=name, values=row)
+
+        self._clear_form((name_entry, category_entry, calories_entry))
+        self._parsed_calories = None
+        self._flash_status(f"התרגיל '{name}' נוסף בהצלחה!")
+
+    def _clear_form(self, entries):
+        """Reset all form fields, then flush redraws once instead of
+        letting each delete schedule its own idle work."""
+        for entry in entries:
+            entry.delete(0, tk.END)
+        self.root.update_idletasks()
+
+    def _flash_status(self, message):
+        """Show a transient status-bar message; unlike a messagebox this
+        never blocks mainloop, so rapid consecutive adds don't stall."""
+        self.status_var.set(message)
+        if self._status_after_id is not None:
+            self.root.after_cancel(self._status_after_id)
+        self._status_after_id = self.root.after(
+            2000, lambda: self.status_var.set("")
+        )
+
+    # ---------------------------------------------------------------- history
+
+    def _create_history_tab(self, frame):
+        columns = ("date", "time", "workout", "duration", "calories")
+        self.history_tree = ttk.Treeview(
+            frame, columns=columns, show="headings", height=15
+        )
+        self.history_tree.heading("date", text="תאריך")
+        self.history_tree.heading("time", text="שעה")
+        self.history_tree.heading("workout", text="אימון")
+        self.history_tree.heading("duration", text="משך (דקות)")
+        self.history_tree.heading("calories", text="קלוריות")
+        for col in columns:
+            self.history_tree.column(col, width=120, anchor=tk.CENTER)
+        self.history_tree.pack(pady=10, padx=20, fill=tk.BOTH, expand=True)
+        self._populate_history_tree()
+
+    def _populate_history_tree(self):
+        if not hasattr(self, "history_tree"):
+            return  # history tab not built yet; it populates on first open
+        tree = self.history_tree
+        tree.delete(*tree.get_children())
+        rows = [
+            (
+                entry["date"],
+                entry["time"],
+                entry["workout"],
+                entry["duration"],
+                entry["calories"],
+            )
+            for entry in self.data_manager.recent_history
+        ]
+        for row in rows:
+            tree.insert("", tk.END, values=row)
+
+    # ------------------------------------------------------------------ stats
+
+    def _create_stats_tab(self, frame):
+        if _load_matplotlib():
+            self._create_weekly_chart(frame)
+        else:
+            ttk.Label(
+                frame,
+                text="התקן matplotlib כדי לראות גרפים 📊",
+                font=("Arial", 12),
+            ).pack(pady=40)
+
+    def _create_weekly_chart(self, parent):
+        weekly = self.data_manager.get_weekly_stats()
+        fig = Figure(figsize=(7, 4), dpi=100)
+        ax = fig.add_subplot(111)
+        days = list(range(7))
+        counts = [weekly["daily_breakdown"][d] for d in days]
+        ax.bar(days, counts, color="#4caf50")
+        ax.set_xticks(days)
+        ax.set_xticklabels(WEEKDAY_NAMES)
+        ax.set_ylabel("אימונים")
+        ax.set_title("אימונים השבוע")
+        canvas = FigureCanvasTkAgg(fig, master=parent)
+        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        # Defer the actual render so the notebook switch paints first;
+        # drawing synchronously here blocks the UI for the full render.
+        self.root.after_idle(canvas.draw)
+
+
+def main():
+    if _load_bootstrap():
+        root = ttkb.Window()
+    else:
+        root = tk.Tk()
+    FitnessApp(root)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()